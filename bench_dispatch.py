@@ -0,0 +1,103 @@
+"""
+Dispatch microbenchmark for `mlx_function_calling_async`
+=======================================================
+Reports calls per second per registered tool through several dispatch paths.
+Importing the demo module does not load the model, so this runs anywhere
+pydantic is installed:
+
+    python bench_dispatch.py          # table
+    python bench_dispatch.py --json   # one JSON line per run, for tracking
+"""
+
+from __future__ import annotations
+
+import asyncio, inspect, json, sys, time, warnings
+from typing import Any, Callable
+
+import mlx_function_calling_async as mfc
+
+BENCH_CALLS: dict[str, dict[str, Any]] = {
+    "get_current_weather": {"location": "Geneva", "unit": "celsius"},
+    "create_file": {"filename": "bench.txt", "filepath": "bench", "content": "x"},
+}
+
+
+def _noop_like(fn: Callable) -> Callable:
+    """Return a no‑op with the same sync/async flavour as *fn*."""
+    if inspect.iscoroutinefunction(fn):
+
+        async def _noop(**_kwargs):
+            return None
+
+    else:
+
+        def _noop(**_kwargs):
+            return None
+
+    return _noop
+
+
+async def _legacy_dispatch(call: dict[str, Any]):
+    """The pre‑compilation dispatch path, kept only as a baseline."""
+    entry = mfc.DISPATCHER[call["name"]]
+    args = entry["model"](**call.get("parameters", {})).dict()
+    fn = entry["func"]
+    if inspect.iscoroutinefunction(fn):
+        return await fn(**args)
+    return fn(**args)
+
+
+async def benchmark_dispatch(iterations: int = 10_000) -> dict[str, float]:
+    """Return calls per second for each tool through several dispatch paths.
+
+    Each tool is temporarily swapped for a no‑op with the same param model, so
+    the rates measure dispatch overhead rather than the tool itself:
+
+      • ``legacy``   – per‑call ``Model(**params).dict()`` + coroutine check
+      • ``dispatch`` – `dispatch_tool_call` with the precompiled record
+      • ``batch``    – `dispatch_tool_calls` over *iterations* calls
+      • ``batch concurrent`` – the same with ``concurrent=True``
+      • ``validate`` – `validate_tool_calls` alone (no invocation)
+    """
+    rates: dict[str, float] = {}
+    for name, params in BENCH_CALLS.items():
+        call = {"name": name, "parameters": params}
+        batch = [call] * iterations
+        real = mfc.DISPATCHER[name]
+        mfc.DISPATCHER[name] = mfc._compile_entry(_noop_like(real["func"]), real["model"])
+        try:
+            with warnings.catch_warnings():  # .dict() is deprecated in pydantic v2
+                warnings.simplefilter("ignore", DeprecationWarning)
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    await _legacy_dispatch(call)
+                rates[f"{name} legacy"] = iterations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await mfc.dispatch_tool_call(call)
+            rates[f"{name} dispatch"] = iterations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await mfc.dispatch_tool_calls(batch)
+            rates[f"{name} batch"] = iterations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await mfc.dispatch_tool_calls(batch, concurrent=True)
+            rates[f"{name} batch concurrent"] = iterations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            mfc.validate_tool_calls(batch)
+            rates[f"{name} validate"] = iterations / (time.perf_counter() - start)
+        finally:
+            mfc.DISPATCHER[name] = real
+    return rates
+
+
+if __name__ == "__main__":
+    rates = asyncio.run(benchmark_dispatch())
+    if "--json" in sys.argv[1:]:
+        print(json.dumps({"time": time.time(), "calls_per_s": rates}))
+    else:
+        for _name, rate in rates.items():
+            print(f"{_name:<36} {rate:>12,.0f} calls/s")
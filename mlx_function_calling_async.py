@@ -6,23 +6,31 @@ Adds the following features to the original `gemma_tool_call.py` example:
   • Parameter validation with **pydantic**.
   • Support for both **async** and sync tool functions.
   • **Sandboxed** file creation so paths can’t escape the `tools/` directory.
+  • Registration‑time compiled dispatch and batch dispatch
+    (microbenchmark: `python bench_dispatch.py [--json]`).
 """
 
 from __future__ import annotations
 
-import asyncio, inspect, json, re, textwrap
+import asyncio, functools, inspect, json, re, textwrap
 from pathlib import Path
 from typing import Callable, Dict, Any
 
 from pydantic import BaseModel, ValidationError, validator
 
 # ----------------------------------------------------------------------
-# 0. Load the Gemma‑3 model (unchanged)
+# 0. Load the Gemma‑3 model (lazily, on first prompt)
 # ----------------------------------------------------------------------
-from mlx_lm import load, generate  # pip install mlx‑lm – GPU/Apple‑silicon only
-
 MODEL_ID = "mlx-community/gemma-3-text-4b-it-4bit"
-model, tokenizer = load(MODEL_ID)
+
+
+@functools.cache
+def load_model():
+    """Load and cache ``(model, tokenizer)`` so importing this module stays cheap."""
+    from mlx_lm import load  # pip install mlx‑lm – GPU/Apple‑silicon only
+
+    return load(MODEL_ID)
+
 
 # ----------------------------------------------------------------------
 # 1. Tool registry + decorator
@@ -31,11 +39,33 @@ _DispatchEntry = Dict[str, Any]
 DISPATCHER: Dict[str, _DispatchEntry] = {}
 
 
+def _compile_validator(params_model: type[BaseModel]) -> Callable[[Any], BaseModel]:
+    """Return a reusable validator for *params_model*, v1 or v2."""
+    if hasattr(params_model, "model_validate"):
+        return params_model.model_validate
+    return params_model.parse_obj  # type: ignore[attr-defined]
+
+
+def _compile_entry(fn: Callable, params_model: type[BaseModel]) -> _DispatchEntry:
+    """Build the dispatch record for *fn*, precomputing its validator and async flag."""
+    return {
+        "func": fn,
+        "model": params_model,
+        "validate": _compile_validator(params_model),
+        "is_async": inspect.iscoroutinefunction(fn),
+    }
+
+
 def tool(name: str, params_model: type[BaseModel]):
-    """Decorator that auto‑registers `fn` in **DISPATCHER** under *name*."""
+    """Decorator that auto‑registers `fn` in **DISPATCHER** under *name*.
+
+    Everything `dispatch_tool_call` needs per call (validator, async flag) is
+    computed once here instead of on every dispatch.  Tools receive validated
+    field values as‑is: nested models stay model instances, not plain dicts.
+    """
 
     def _register(fn: Callable):
-        DISPATCHER[name] = {"func": fn, "model": params_model}
+        DISPATCHER[name] = _compile_entry(fn, params_model)
         return fn
 
     return _register
@@ -78,7 +108,6 @@ async def get_current_weather(location: str, unit: str = "celsius") -> dict[str,
 
 
 SANDBOX_ROOT = Path("sandbox").resolve()
-SANDBOX_ROOT.mkdir(parents=True, exist_ok=True)
 
 
 def _sandbox_path(filename: str, filepath: str) -> Path:
@@ -149,6 +178,7 @@ def build_prompt(user_message: str) -> str:
         {"role": "system", "content": setup},
         {"role": "user", "content": user_message},
     ]
+    _model, tokenizer = load_model()
     return tokenizer.apply_chat_template(messages, add_generation_prompt=True)
 
 
@@ -156,28 +186,103 @@ def build_prompt(user_message: str) -> str:
 # 6. LLM interaction + **async** dispatch ----------------------------------------
 # ----------------------------------------------------------------------
 
-async def dispatch_tool_call(call: dict[str, Any]):
+def _validate_call(call: dict[str, Any]) -> tuple[_DispatchEntry, dict[str, Any]]:
+    """Resolve *call* against the registry and return ``(entry, kwargs)``."""
+    if not isinstance(call, dict):
+        raise RuntimeError(f"Tool call must be a JSON object, got {type(call).__name__}")
+
     name = call.get("name")
+    if not isinstance(name, str):
+        raise RuntimeError(f"Tool name must be a string, got {type(name).__name__}")
+
     entry = DISPATCHER.get(name)
     if entry is None:
         raise RuntimeError(f"Unknown function: {name!r}")
 
-    # 1️⃣ Validate parameters via pydantic
     try:
-        params_obj = entry["model"](**call.get("parameters", {}))
+        params_obj = entry["validate"](call.get("parameters") or {})
     except ValidationError as exc:
         raise RuntimeError(f"Parameter validation failed: {exc}") from exc
 
-    # 2️⃣ Call (await if coroutine)
+    # Copy field values as‑is (several times faster than iterating the model);
+    # unlike .dict() / .model_dump(), nested models are *not* serialised.
+    kwargs = params_obj.__dict__.copy()
+    extra = getattr(params_obj, "__pydantic_extra__", None)  # pydantic v2 only
+    if extra:
+        kwargs.update(extra)
+    return entry, kwargs
+
+
+async def _invoke(entry: _DispatchEntry, kwargs: dict[str, Any]):
     fn = entry["func"]
-    args = params_obj.dict()  # pydantic v1; use .model_dump() for v2
-    if inspect.iscoroutinefunction(fn):
-        return await fn(**args)
-    return fn(**args)  # sync fallback
+    if entry["is_async"]:
+        return await fn(**kwargs)
+    return fn(**kwargs)  # sync fallback
+
+
+async def dispatch_tool_call(call: dict[str, Any]):
+    entry, kwargs = _validate_call(call)
+    return await _invoke(entry, kwargs)
+
+
+def validate_tool_calls(calls: list[dict[str, Any]]) -> list[Any]:
+    """Validate each of *calls* in turn, collecting errors instead of raising.
+
+    Returns one item per call, in order: ``(entry, kwargs)`` on success or the
+    `RuntimeError` describing why the call was rejected.
+    """
+    validated: list[Any] = []
+    for call in calls:
+        try:
+            validated.append(_validate_call(call))
+        except RuntimeError as exc:
+            validated.append(exc)
+    return validated
+
+
+async def dispatch_tool_calls(
+    calls: list[dict[str, Any]], *, concurrent: bool = False
+) -> list[Any]:
+    """Validate all *calls* up front, then run the valid ones.
+
+    By default calls run one after another, which is cheapest for tools that
+    don't wait on I/O.  With *concurrent* the async tools are gathered (one
+    Task each) – only worth it when they actually block; sync tools always run
+    inline.  Results keep the order of *calls*; a call that fails validation
+    or raises yields its exception instead of a result.
+    """
+    results: list[Any] = []
+    gathered: list[tuple[int, Any]] = []  # (slot, coroutine) for concurrent mode
+    for item in validate_tool_calls(calls):
+        if isinstance(item, Exception):
+            results.append(item)
+            continue
+
+        entry, kwargs = item
+        if concurrent and entry["is_async"]:
+            gathered.append((len(results), entry["func"](**kwargs)))
+            results.append(None)
+            continue
+
+        try:
+            results.append(await _invoke(entry, kwargs))
+        except Exception as exc:  # noqa: BLE001, reported in the call's slot
+            results.append(exc)
+
+    if gathered:
+        outcomes = await asyncio.gather(
+            *(coro for _slot, coro in gathered), return_exceptions=True
+        )
+        for (slot, _coro), outcome in zip(gathered, outcomes):
+            results[slot] = outcome
+    return results
 
 
 async def handle_request(user_message: str):
     prompt = build_prompt(user_message)
+    from mlx_lm import generate
+
+    model, tokenizer = load_model()
     raw = generate(model, tokenizer, prompt=prompt, max_tokens=1024)
     print("Raw model output:\n", raw, "\n")
 
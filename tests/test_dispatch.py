@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+import mlx_function_calling_async as mfc
+
+
+class EchoParams(BaseModel):
+    value: int
+
+
+@pytest.fixture
+def echo_tools(monkeypatch):
+    """Register a sync and an async echo tool for the duration of a test."""
+
+    def sync_echo(value: int):
+        return ("sync", value)
+
+    async def async_echo(value: int):
+        return ("async", value)
+
+    def boom(value: int):
+        raise ValueError(value)
+
+    monkeypatch.setitem(mfc.DISPATCHER, "sync_echo", mfc._compile_entry(sync_echo, EchoParams))
+    monkeypatch.setitem(mfc.DISPATCHER, "async_echo", mfc._compile_entry(async_echo, EchoParams))
+    monkeypatch.setitem(mfc.DISPATCHER, "boom", mfc._compile_entry(boom, EchoParams))
+
+
+def test_dispatch_tool_call_sync_and_async(echo_tools):
+    sync = {"name": "sync_echo", "parameters": {"value": "1"}}
+    async_ = {"name": "async_echo", "parameters": {"value": 2}}
+
+    assert asyncio.run(mfc.dispatch_tool_call(sync)) == ("sync", 1)
+    assert asyncio.run(mfc.dispatch_tool_call(async_)) == ("async", 2)
+
+
+def test_validate_tool_calls_puts_errors_in_their_slot(echo_tools):
+    validated = mfc.validate_tool_calls(
+        [
+            {"name": "sync_echo", "parameters": {"value": 1}},
+            {"name": "missing"},
+            {"name": ["sync_echo"]},
+            {"name": "sync_echo", "parameters": {"value": "nope"}},
+            ["not", "an", "object"],
+        ]
+    )
+
+    entry, kwargs = validated[0]
+    assert entry is mfc.DISPATCHER["sync_echo"]
+    assert kwargs == {"value": 1}
+    assert all(isinstance(item, RuntimeError) for item in validated[1:])
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_dispatch_tool_calls_keeps_order(echo_tools, concurrent):
+    results = asyncio.run(
+        mfc.dispatch_tool_calls(
+            [
+                {"name": "async_echo", "parameters": {"value": 1}},
+                "bad",
+                {"name": "sync_echo", "parameters": {"value": 2}},
+                {"name": "boom", "parameters": {"value": 3}},
+                {"name": "async_echo", "parameters": {"value": 4}},
+            ],
+            concurrent=concurrent,
+        )
+    )
+
+    assert results[0] == ("async", 1)
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == ("sync", 2)
+    assert isinstance(results[3], ValueError)
+    assert results[4] == ("async", 4)